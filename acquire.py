@@ -11,6 +11,7 @@ import sys
 import time
 import logging
 import warnings
+import numpy as np
 import pandas as pd
 import xarray as xr
 from datetime import datetime as Datetime
@@ -44,6 +45,10 @@ __copyright__ = "Copyright 2024, Jack Kirby Cook"
 __license__ = "MIT License"
 
 
+APY = ("apy", Variables.Scenarios.MINIMUM)
+COST = ("cost", Variables.Scenarios.MINIMUM)
+SIZE = ("size", "")
+
 class OptionDirectoryProducer(Directory, Producer, query=Querys.Contract): pass
 class OptionLoaderProcessor(Loader, Processor, query=Querys.Contract): pass
 class OptionFilterProcessor(Filter, Processor, query=Querys.Contract): pass
@@ -68,7 +73,9 @@ class AcquisitionProfit(Naming, fields=["apy", "cost"]): pass
 class OptionCriterion(object, named={"sizing": AcquisitionSizing, "timing": AcquisitionTiming, "profit": AcquisitionProfit}, metaclass=NamingMeta):
     def __iter__(self): return iter([self.interest, self.volume, self.size, self.date])
 
-    def date(self, table): return table["current"].dt.date == self.timing.current.date()
+    def date(self, table):
+        opening = np.datetime64(self.timing.current.date(), "ns")
+        return (table["current"] >= opening) & (table["current"] < opening + np.timedelta64(1, "D"))
     def interest(self, table): return table["interest"] >= self.sizing.interest
     def volume(self, table): return table["volume"] >= self.sizing.volume
     def size(self, table): return table["size"] >= self.sizing.size
@@ -76,41 +83,46 @@ class OptionCriterion(object, named={"sizing": AcquisitionSizing, "timing": Acqu
 class ValuationCriterion(object, named={"sizing": AcquisitionSizing, "profit": AcquisitionProfit}, metaclass=NamingMeta):
     def __iter__(self): return iter([self.apy, self.cost, self.size])
 
-    def apy(self, table): return table[("apy", Variables.Scenarios.MINIMUM)] >= self.profit.apy
-    def cost(self, table): return table[("cost", Variables.Scenarios.MINIMUM)] <= self.profit.cost
-    def size(self, table): return table[("size", "")] >= self.sizing.size
+    def apy(self, table): return table[APY] >= self.profit.apy
+    def cost(self, table): return table[COST] <= self.profit.cost
+    def size(self, table): return table[SIZE] >= self.sizing.size
 
 class AcquisitionProtocol(Decorator): pass
 class AcquisitionProtocols(object, named={"trading": AcquisitionTrading, "timing": AcquisitionTiming}, metaclass=NamingMeta):
     def __iter__(self): return iter([(method, method["status"]) for method in [self.obsolete, self.abandon, self.pursue, self.reject, self.accept]])
 
-    def limited(self, mask): return (mask.cumsum() < self.trading.capacity + 1) & mask
-    def timeout(self, table): return (pd.to_datetime(self.timing.current) - table["current"]) >= self.timing.tenure
-    def obsolete(self, table): return (table["status"] == Variables.Status.PROSPECT) & self.timeout(table)
-    def unattractive(self, table): return table["priority"] < self.trading.discount
-    def attractive(self, table): return table["priority"] >= self.trading.discount
-    def illiquid(self, table): return table["size"] < self.trading.liquidity
-    def liquid(self, table): return table["size"] >= self.trading.liquidity
+    def limited(self, mask):
+        limited = np.zeros_like(mask, dtype=np.bool_)
+        limited[np.flatnonzero(mask)[:self.trading.capacity]] = True
+        return limited
+
+    def status(self, table, status): return table["status"].to_numpy() == status
+    def timeout(self, table): return table["current"].to_numpy() <= np.datetime64(self.timing.current - self.timing.tenure, "ns")
+    def unattractive(self, table): return table["priority"].to_numpy() < self.trading.discount
+    def attractive(self, table): return table["priority"].to_numpy() >= self.trading.discount
+    def illiquid(self, table): return table["size"].to_numpy() < self.trading.liquidity
+    def liquid(self, table): return table["size"].to_numpy() >= self.trading.liquidity
 
     @AcquisitionProtocol(status=Variables.Status.OBSOLETE)
-    def obsolete(self, table): return (table["status"] == Variables.Status.PROSPECT) & self.timeout(table)
+    def obsolete(self, table): return pd.Series(self.status(table, Variables.Status.PROSPECT) & self.timeout(table), index=table.index)
     @AcquisitionProtocol(status=Variables.Status.ABANDONED)
-    def abandon(self, table): return self.limited((table["status"] == Variables.Status.PROSPECT) & self.unattractive(table))
+    def abandon(self, table): return pd.Series(self.limited(self.status(table, Variables.Status.PROSPECT) & self.unattractive(table)), index=table.index)
     @AcquisitionProtocol(status=Variables.Status.PENDING)
-    def pursue(self, table): return self.limited((table["status"] == Variables.Status.PROSPECT) & self.attractive(table))
+    def pursue(self, table): return pd.Series(self.limited(self.status(table, Variables.Status.PROSPECT) & self.attractive(table)), index=table.index)
     @AcquisitionProtocol(status=Variables.Status.REJECTED)
-    def reject(self, table): return self.limited((table["status"] == Variables.Status.PENDING) & self.illiquid(table))
+    def reject(self, table): return pd.Series(self.limited(self.status(table, Variables.Status.PENDING) & self.illiquid(table)), index=table.index)
     @AcquisitionProtocol(status=Variables.Status.ACCEPTED)
-    def accept(self, table): return self.limited((table["status"] == Variables.Status.PENDING) & self.liquid(table))
+    def accept(self, table): return pd.Series(self.limited(self.status(table, Variables.Status.PENDING) & self.liquid(table)), index=table.index)
 
 
 def main(*args, parameters={}, namespace={}, **kwargs):
     acquisition_layout = ProspectLayout(name="AcquisitionLayout", valuation=Variables.Valuations.ARBITRAGE, rows=100)
     acquisition_header = ProspectHeader(name="AcquisitionHeader", valuation=Variables.Valuations.ARBITRAGE)
+    acquisition_transform = tuple(acquisition_header.transform)
     acquisition_table = ProspectTable(name="AcquisitionTable", layout=acquisition_layout, header=acquisition_header)
     holding_file = HoldingFile(name="HoldingFile", repository=PORTFOLIO)
     option_file = OptionFile(name="OptionFile", repository=MARKET)
-    acquisition_priority = lambda cols: cols[("apy", Variables.Scenarios.MINIMUM)]
+    acquisition_priority = lambda cols: cols[APY]
     acquisition_protocols = AcquisitionProtocols(namespace)
     valuation_criterion = ValuationCriterion(namespace)
     option_criterion = OptionCriterion(namespace)
@@ -120,14 +132,14 @@ def main(*args, parameters={}, namespace={}, **kwargs):
     option_filter = OptionFilterProcessor(name="OptionFilter", criterion=list(option_criterion))
     strategy_calculator = StrategyCalculatorProcessor(name="StrategyCalculator", strategies=Variables.Strategies)
     valuation_calculator = ValuationCalculatorProcessor(name="ValuationCalculator", valuation=Variables.Valuations.ARBITRAGE)
-    valuation_pivot = ValuationPivotProcessor(name="ValuationPivot", header=tuple(acquisition_header.transform))
+    valuation_pivot = ValuationPivotProcessor(name="ValuationPivot", header=acquisition_transform)
     valuation_filter = ValuationFilterProcessor(name="ValuationFilter", criterion=list(valuation_criterion))
     prospect_calculator = ProspectCalculatorProcessor(name="ProspectCalculator", header=acquisition_header, priority=acquisition_priority)
     prospect_writer = ProspectWriterConsumer(name="ProspectWriter", table=acquisition_table, status=Variables.Status.PROSPECT)
     prospect_discarding = ProspectDiscardingRoutine(name="ProspectDiscarding", table=acquisition_table, status=[Variables.Status.OBSOLETE, Variables.Status.REJECTED, Variables.Status.ABANDONED])
     prospect_protocol = ProspectProtocolsRoutine(name="ProspectAltering", table=acquisition_table, protocols=dict(acquisition_protocols))
     prospect_reader = ProspectReaderProducer(name="ProspectReader", table=acquisition_table, status=[Variables.Status.ACCEPTED])
-    prospect_unpivot = ProspectUnpivotProcessor(name="ProspectUnpivot", header=tuple(acquisition_header.transform))
+    prospect_unpivot = ProspectUnpivotProcessor(name="ProspectUnpivot", header=acquisition_transform)
     holding_calculator = HoldingCalculatorProcessor(name="HoldingCalculator")
     holding_saver = HoldingSaverConsumer(name="HoldingSaver", file=holding_file, mode="a")
 
@@ -142,8 +154,11 @@ def main(*args, parameters={}, namespace={}, **kwargs):
     protocol_thread.start()
     discarding_thread.start()
     valuation_thread.start()
+    rendered = str()
     while bool(valuation_thread) or bool(acquisition_table):
-        if bool(acquisition_table): print(acquisition_table)
+        current = str(acquisition_table) if bool(acquisition_table) else str()
+        if bool(current) and current != rendered: print(current)
+        rendered = current
         time.sleep(10)
     discarding_thread.cease()
     protocol_thread.cease()
@@ -8,9 +8,11 @@ Created on Weds Jun 13 2024
 
 import os
 import sys
-import time
+import signal
+import threading
 import logging
 import warnings
+import numpy as np
 import pandas as pd
 import xarray as xr
 from datetime import datetime as Datetime
@@ -49,6 +51,10 @@ __copyright__ = "Copyright 2024, Jack Kirby Cook"
 __license__ = "MIT License"
 
 
+APY = ("apy", Variables.Scenarios.MINIMUM)
+COST = ("cost", Variables.Scenarios.MINIMUM)
+SIZE = ("size", "")
+
 class HoldingDirectorySource(Directory, Source, query=Querys.Contract, signature="->contract"): pass
 class HoldingLoaderProcess(Loader, Algorithm, query=Querys.Contract, signature="contract->holdings"): pass
 class ExposureCalculatorProcess(ExposureCalculator, Algorithm, signature="holdings->exposures"): pass
@@ -64,7 +70,6 @@ class ProspectCalculatorProcess(ProspectCalculator, Algorithm, signature="valuat
 class OrderCalculatorProcess(OrderCalculator, Algorithm, signature="prospects->orders"): pass
 class StabilityCalculatorProcess(StabilityCalculator, Algorithm, signature="(orders,exposures)->stabilities"): pass
 class StabilityFilterProcess(StabilityFilter, Algorithm, signature="(prospects,stabilities)->prospects"): pass
-class ProspectUnpivotProcessor(Unpivot, Algorithm, query=Querys.Contract, signature="prospects->prospects"): pass
 class ProspectWriterProcess(ProspectWriter, Algorithm, query=Querys.Contract, signature="prospects->"): pass
 class ProspectDiscardingRoutine(ProspectDiscarding, Routine, query=Querys.Contract): pass
 class ProspectProspectsRoutine(ProspectProtocols, Routine, query=Querys.Contract): pass
@@ -89,41 +94,46 @@ class OptionCriterion(object, named={"sizing": DivestitureSizing}, metaclass=Nam
 class ValuationCriterion(object, named={"sizing": DivestitureSizing, "profit": DivestitureProfit}, metaclass=NamingMeta):
     def __iter__(self): return iter([self.apy, self.cost, self.size])
 
-    def apy(self, table): return table[("apy", Variables.Scenarios.MINIMUM)] >= self.profit.apy
-    def cost(self, table): return table[("cost", Variables.Scenarios.MINIMUM)] <= self.profit.cost
-    def size(self, table): return table[("size", "")] >= self.sizing.size
+    def apy(self, table): return table[APY] >= self.profit.apy
+    def cost(self, table): return table[COST] <= self.profit.cost
+    def size(self, table): return table[SIZE] >= self.sizing.size
 
 class DivestitureProtocol(Decorator): pass
 class DivestitureProtocols(object, named={"trading": DivestitureTrading, "timing": DivestitureTiming}, metaclass=NamingMeta):
     def __iter__(self): return iter([(method, method["status"]) for method in [self.obsolete, self.abandon, self.pursue, self.reject, self.accept]])
 
-    def limited(self, mask): return (mask.cumsum() < self.trading.capacity + 1) & mask
-    def timeout(self, table): return (pd.to_datetime(self.timing.current) - table["current"]) >= self.timing.tenure
-    def obsolete(self, table): return (table["status"] == Variables.Status.PROSPECT) & self.timeout(table)
-    def unattractive(self, table): return table["priority"] < self.trading.discount
-    def attractive(self, table): return table["priority"] >= self.trading.discount
-    def illiquid(self, table): return table["size"] < self.trading.liquidity
-    def liquid(self, table): return table["size"] >= self.trading.liquidity
+    def limited(self, mask):
+        limited = np.zeros_like(mask, dtype=np.bool_)
+        limited[np.flatnonzero(mask)[:self.trading.capacity]] = True
+        return limited
+
+    def status(self, table, status): return table["status"].to_numpy() == status
+    def timeout(self, table): return table["current"].to_numpy() <= np.datetime64(self.timing.current - self.timing.tenure, "ns")
+    def unattractive(self, table): return table["priority"].to_numpy() < self.trading.discount
+    def attractive(self, table): return table["priority"].to_numpy() >= self.trading.discount
+    def illiquid(self, table): return table["size"].to_numpy() < self.trading.liquidity
+    def liquid(self, table): return table["size"].to_numpy() >= self.trading.liquidity
 
     @DivestitureProtocol(status=Variables.Status.OBSOLETE)
-    def obsolete(self, table): return (table["status"] == Variables.Status.PROSPECT) & self.timeout(table)
+    def obsolete(self, table): return pd.Series(self.status(table, Variables.Status.PROSPECT) & self.timeout(table), index=table.index)
     @DivestitureProtocol(status=Variables.Status.ABANDONED)
-    def abandon(self, table): return self.limited((table["status"] == Variables.Status.PROSPECT) & self.unattractive(table))
+    def abandon(self, table): return pd.Series(self.limited(self.status(table, Variables.Status.PROSPECT) & self.unattractive(table)), index=table.index)
     @DivestitureProtocol(status=Variables.Status.PENDING)
-    def pursue(self, table): return self.limited((table["status"] == Variables.Status.PROSPECT) & self.attractive(table))
+    def pursue(self, table): return pd.Series(self.limited(self.status(table, Variables.Status.PROSPECT) & self.attractive(table)), index=table.index)
     @DivestitureProtocol(status=Variables.Status.REJECTED)
-    def reject(self, table): return self.limited((table["status"] == Variables.Status.PENDING) & self.illiquid(table))
+    def reject(self, table): return pd.Series(self.limited(self.status(table, Variables.Status.PENDING) & self.illiquid(table)), index=table.index)
     @DivestitureProtocol(status=Variables.Status.ACCEPTED)
-    def accept(self, table): return self.limited((table["status"] == Variables.Status.PENDING) & self.liquid(table))
+    def accept(self, table): return pd.Series(self.limited(self.status(table, Variables.Status.PENDING) & self.liquid(table)), index=table.index)
 
 
 def main(*args, parameters={}, namespace={}, **kwargs):
     divestiture_layout = ProspectLayout(name="DivestitureLayout", valuation=Variables.Valuations.ARBITRAGE, rows=100)
     divestiture_header = ProspectHeader(name="DivestitureHeader", valuation=Variables.Valuations.ARBITRAGE)
+    divestiture_transform = tuple(divestiture_header.transform)
     divestiture_table = ProspectTable(name="DivestitureTable", layout=divestiture_layout, header=divestiture_header)
     holding_file = HoldingFile(name="HoldingFile", repository=PORTFOLIO)
     history_file = HistoryFile(name="HistoryFile", repository=HISTORY)
-    divestiture_priority = lambda cols: cols[("apy", Variables.Scenarios.MINIMUM)]
+    divestiture_priority = lambda cols: cols[APY]
     divestiture_protocols = DivestitureProtocols(namespace)
     valuation_criterion = ValuationCriterion(namespace)
     option_criterion = OptionCriterion(namespace)
@@ -138,7 +148,7 @@ def main(*args, parameters={}, namespace={}, **kwargs):
     option_filter = OptionFilterOperation(name="OptionFilter", criterion=list(option_criterion))
     strategy_calculator = StrategyCalculatorProcess(name="StrategyCalculator", strategies=Variables.Strategies)
     valuation_calculator = ValuationCalculatorProcess(name="ValuationCalculator", valuation=Variables.Valuations.ARBITRAGE)
-    valuation_pivot = ValuationPivotProcessor(name="ValuationPivot", header=tuple(divestiture_header.transform))
+    valuation_pivot = ValuationPivotProcessor(name="ValuationPivot", header=divestiture_transform)
     valuation_filter = ValuationFilterProcess(name="ValuationFilter", criterion=list(valuation_criterion))
     prospect_calculator = ProspectCalculatorProcess(name="ProspectCalculator", header=divestiture_header, priority=divestiture_priority)
     order_calculator = OrderCalculatorProcess(name="OrderCalculator")
@@ -148,7 +158,7 @@ def main(*args, parameters={}, namespace={}, **kwargs):
     prospect_discarding = ProspectDiscardingRoutine(name="ProspectDiscarding", table=divestiture_table, status=[Variables.Status.OBSOLETE, Variables.Status.REJECTED, Variables.Status.ABANDONED])
     prospect_protocol = ProspectProspectsRoutine(name="ProspectAltering", table=divestiture_table, protocols=dict(divestiture_protocols))
     prospect_reader = ProspectReaderSource(name="ProspectReader", table=divestiture_table, status=[Variables.Status.ACCEPTED])
-    prospect_unpivot = ProspectUnpivotProcessor(name="ProspectUnpivot", header=tuple(divestiture_header.transform))
+    prospect_unpivot = ProspectUnpivotProcessor(name="ProspectUnpivot", header=divestiture_transform)
     holding_calculator = HoldingCalculatorProcess(name="HoldingCalculator")
     holding_saver = HoldingSaverProcess(name="HoldingSaver", file=holding_file, mode="a")
 
@@ -161,10 +171,19 @@ def main(*args, parameters={}, namespace={}, **kwargs):
     protocol_thread = RepeatingThread(prospect_protocol, name="AlteringThread", wait=10).setup(**parameters)
     divestiture_thread = RepeatingThread(divestiture_process, name="AlteringThread", wait=10).setup(**parameters)
 
-    valuations_thread.start()
-    while True:
-        if bool(divestiture_table): print(divestiture_table)
-        time.sleep(10)
+    stopping = threading.Event()
+    previous = signal.signal(signal.SIGINT, lambda *args: stopping.set())
+    try:
+        valuations_thread.start()
+        rendered = str()
+        while not stopping.is_set():
+            current = str(divestiture_table) if bool(divestiture_table) else str()
+            if bool(current) and current != rendered: print(current)
+            rendered = current
+            stopping.wait(timeout=10)
+    finally:
+        signal.signal(signal.SIGINT, previous)
+    valuations_thread.cease()
     valuations_thread.join()
 
 